@@ -0,0 +1,20 @@
+#!/usr/bin/env python3
+"""
+Build the codegen_fastpath extension used by mock_codegen for batch classification.
+
+Compiling ahead of time with numba.pycc means the mock never has to import
+Numba or JIT the kernel at runtime. Requires numba, numpy and setuptools.
+
+Usage:
+    python build_codegen_fastpath.py
+"""
+
+from numba.pycc import CC
+
+from mock_codegen import _scan_tags
+
+cc = CC("codegen_fastpath")
+cc.export("classify_batch", "i1[:](u1[:], i8[:], u1[:], i8[:], i1[:])")(_scan_tags)
+
+if __name__ == "__main__":
+    cc.compile()
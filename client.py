@@ -1,7 +1,36 @@
 import requests
 import json
+import random
 import time
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Built once rather than per request; requests merges these with the session defaults
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Task statuses after which polling stops
+_TERMINAL_STATUSES = frozenset({"completed", "failed"})
+
+# Private generator for poll jitter, so polling does not contend on the global random state
+_poll_random = random.Random()
+
+
+def _check_jitter(jitter: float) -> None:
+    """Reject jitter that could scale a poll delay below zero"""
+    if not 0 <= jitter <= 1:
+        raise ValueError(f"jitter must be between 0 and 1, got {jitter}")
+
+
+def _decode_json(response: requests.Response) -> Any:
+    """Decode a JSON response body, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
 
 class MCPClient:
     """Client for interacting with the MCP Prompt Template Server"""
@@ -13,6 +42,18 @@ class MCPClient:
             base_url: The base URL of the MCP server
         """
         self.base_url = base_url.rstrip('/')
+        # One session for the client's lifetime so requests reuse pooled keep-alive connections
+        self._session = requests.Session()
+    
+    def close(self) -> None:
+        """Close the underlying HTTP session and its pooled connections"""
+        self._session.close()
+    
+    def __enter__(self) -> "MCPClient":
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
     
     def execute_pr_creation(self, context: str, additional_params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Execute PR creation template with the given context
@@ -100,16 +141,32 @@ class MCPClient:
         if additional_params is None:
             additional_params = {}
             
-        url = f"{self.base_url}/api/{endpoint}"
         payload = {
             "context": context,
             "additional_params": additional_params
         }
         
-        response = requests.post(url, json=payload)
+        if orjson is not None:
+            # Non-string keys are stringified, as the stdlib encoder behind json= does
+            body = orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS)
+            return self._request("POST", f"/api/{endpoint}", data=body, headers=_JSON_HEADERS)
+        return self._request("POST", f"/api/{endpoint}", json=payload)
+    
+    def _request(self, method: str, path: str, **kwargs: Any) -> Any:
+        """Send a request to the server and return the decoded JSON body
+        
+        Args:
+            method: The HTTP method
+            path: The path relative to the base URL
+            **kwargs: Extra arguments passed to requests
+            
+        Returns:
+            The decoded response body
+        """
+        response = self._session.request(method, self.base_url + path, **kwargs)
         response.raise_for_status()
         
-        return response.json()
+        return _decode_json(response)
     
     def get_task_status(self, task_id: str) -> Dict[str, Any]:
         """Get the status of a task
@@ -120,61 +177,140 @@ class MCPClient:
         Returns:
             Task information including status and result if available
         """
-        url = f"{self.base_url}/api/tasks/{task_id}"
-        response = requests.get(url)
-        response.raise_for_status()
-        
-        return response.json()
+        return self._request("GET", f"/api/tasks/{task_id}")
     
-    def list_tasks(self) -> Dict[str, Any]:
+    def list_tasks(self, task_ids: Optional[List[str]] = None) -> List[Dict[str, Any]]:
         """List all tasks
         
+        Args:
+            task_ids: Only return these tasks; unknown IDs are omitted
+        
         Returns:
             List of all tasks
         """
-        url = f"{self.base_url}/api/tasks"
-        response = requests.get(url)
-        response.raise_for_status()
-        
-        return response.json()
+        if task_ids is None:
+            return self._request("GET", "/api/tasks")
+        # requests drops an empty list from the query string, which would list every task
+        if not task_ids:
+            return []
+        return self._request("GET", "/api/tasks", params={"ids": task_ids})
     
-    def wait_for_task_completion(self, task_id: str, timeout: int = 600, polling_interval: int = 5) -> Dict[str, Any]:
+    def wait_for_task_completion(
+        self,
+        task_id: str,
+        timeout: int = 600,
+        polling_interval: float = 0.25,
+        max_polling_interval: float = 10.0,
+        jitter: float = 0.5
+    ) -> Dict[str, Any]:
         """Wait for a task to complete
         
+        Polls with exponential backoff, starting at polling_interval and doubling up
+        to max_polling_interval. The backoff restarts whenever the task changes status.
+        
         Args:
             task_id: The ID of the task
             timeout: Maximum time to wait in seconds
-            polling_interval: Time between status checks in seconds
+            polling_interval: Initial time between status checks in seconds
+            max_polling_interval: Upper bound on the time between status checks in seconds
+            jitter: Fraction between 0 and 1 by which each delay is randomly scaled up
+                or down, so concurrent pollers do not hit the server in lockstep
             
         Returns:
             The completed task information
         """
-        start_time = time.time()
+        _check_jitter(jitter)
+        start_time = time.monotonic()
+        delay = polling_interval
+        last_status = None
         
-        while time.time() - start_time < timeout:
+        while time.monotonic() - start_time < timeout:
             task_info = self.get_task_status(task_id)
             
-            if task_info["status"] in ["completed", "failed"]:
+            if task_info["status"] in _TERMINAL_STATUSES:
                 return task_info
             
-            time.sleep(polling_interval)
+            if task_info["status"] != last_status:
+                last_status = task_info["status"]
+                delay = polling_interval
+            
+            time.sleep(delay * _poll_random.uniform(1 - jitter, 1 + jitter))
+            delay = min(delay * 2, max_polling_interval)
         
         raise TimeoutError(f"Task {task_id} did not complete within the specified timeout of {timeout} seconds")
+    
+    def wait_for_tasks(
+        self,
+        task_ids: List[str],
+        timeout: int = 600,
+        polling_interval: float = 0.25,
+        max_polling_interval: float = 10.0,
+        jitter: float = 0.5
+    ) -> List[Dict[str, Any]]:
+        """Wait for several tasks to complete
+        
+        All unfinished tasks are checked with a single request per poll, using the
+        same backoff as wait_for_task_completion. The backoff restarts whenever a
+        task finishes.
+        
+        Args:
+            task_ids: The IDs of the tasks
+            timeout: Maximum time to wait in seconds
+            polling_interval: Initial time between status checks in seconds
+            max_polling_interval: Upper bound on the time between status checks in seconds
+            jitter: Fraction between 0 and 1 by which each delay is randomly scaled up or down
+            
+        Returns:
+            The completed task information, in the order of task_ids
+        """
+        _check_jitter(jitter)
+        if not task_ids:
+            return []
+        
+        start_time = time.monotonic()
+        delay = polling_interval
+        finished: Dict[str, Dict[str, Any]] = {}
+        pending = list(dict.fromkeys(task_ids))
+        
+        while time.monotonic() - start_time < timeout:
+            task_infos = self.list_tasks(task_ids=pending)
+            
+            missing = set(pending).difference(task_info["task_id"] for task_info in task_infos)
+            if missing:
+                raise ValueError(f"Unknown task IDs: {', '.join(sorted(missing))}")
+            
+            for task_info in task_infos:
+                if task_info["status"] in _TERMINAL_STATUSES:
+                    finished[task_info["task_id"]] = task_info
+            
+            still_pending = [task_id for task_id in pending if task_id not in finished]
+            if not still_pending:
+                return [finished[task_id] for task_id in task_ids]
+            
+            if len(still_pending) < len(pending):
+                delay = polling_interval
+            pending = still_pending
+            
+            time.sleep(delay * _poll_random.uniform(1 - jitter, 1 + jitter))
+            delay = min(delay * 2, max_polling_interval)
+        
+        raise TimeoutError(f"Tasks {', '.join(pending)} did not complete within the specified timeout of {timeout} seconds")
 
 # Usage example
 if __name__ == "__main__":
-    client = MCPClient()
+    from examples._contexts import PR_CREATION_CONTEXT
     
-    # Example: Create a PR
-    response = client.execute_pr_creation(
-        context="Create a pull request for adding user authentication features. The changes include new login/logout endpoints, JWT token handling, and user session management."
-    )
-    
-    print(f"Task created with ID: {response['task_id']}")
-    
-    # Wait for the task to complete
-    result = client.wait_for_task_completion(response['task_id'])
-    
-    print(f"Task status: {result['status']}")
-    if result['status'] == 'completed':
-        print(f"Result: {json.dumps(result['result'], indent=2)}")
+    with MCPClient() as client:
+        # Example: Create a PR
+        response = client.execute_pr_creation(
+            context=PR_CREATION_CONTEXT
+        )
+        
+        print(f"Task created with ID: {response['task_id']}")
+        
+        # Wait for the task to complete
+        result = client.wait_for_task_completion(response['task_id'])
+        
+        print(f"Task status: {result['status']}")
+        if result['status'] == 'completed':
+            print(f"Result: {json.dumps(result['result'], indent=2)}")
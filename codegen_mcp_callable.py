@@ -166,9 +166,16 @@ class CodegenMCPCallable:
         
         # Return the result if completed
         if task.status == "completed":
-            return task.result
+            result = task.result
+        else:
+            result = {"status": task.status, "message": "Task not completed yet"}
         
-        return {"status": task.status, "message": "Task not completed yet"}
+        # Mock tasks go back to their pool once the result has been read; SDK tasks have no close()
+        close = getattr(task, "close", None)
+        if close is not None:
+            close()
+        
+        return result
     
     def create_pr(self, context: str, additional_params: Optional[Dict[str, Any]] = None) -> Any:
         """
@@ -250,12 +257,14 @@ class CodegenMCPCallable:
 
 # Example usage
 if __name__ == "__main__":
+    from examples._contexts import PR_CREATION_CONTEXT
+    
     # Create an instance of CodegenMCPCallable
     mcp = CodegenMCPCallable()
     
     # Example: Create a PR
     result = mcp.create_pr(
-        context="Create a pull request for adding user authentication features. The changes include new login/logout endpoints, JWT token handling, and user session management."
+        context=PR_CREATION_CONTEXT
     )
     
     print(f"Result: {result}")
@@ -12,35 +12,54 @@ Each endpoint uses the same underlying function with different prompt templates.
 """
 
 import os
+import time
 import asyncio
-from typing import Dict, Any, Optional
+import copy
+import dataclasses
+import functools
+import hashlib
+import anyio
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
 from fastmcp import FastMCP, Context
 
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
 # Import the Codegen SDK
 try:
     from codegen import Agent
 except ImportError:
     print("Codegen SDK not found. Please install it with: pip install codegen")
     print("For now, we'll use a mock implementation for demonstration purposes.")
+    from mock_codegen import Agent
 
-    class MockTask:
-        def __init__(self, prompt):
-            self.prompt = prompt
-            self.status = "pending"
-            self.result = None
-        
-        def refresh(self):
-            # Simulate task completion
-            self.status = "completed"
-            self.result = f"Completed task with prompt: {self.prompt}"
-    
-    class Agent:
-        def __init__(self, org_id=None, token=None):
-            self.org_id = org_id
-            self.token = token
-        
-        def run(self, prompt):
-            return MockTask(prompt)
+# Task polling backs off from the initial to the maximum delay, in seconds, so fast tasks
+# are noticed quickly without hammering the API while slow ones run
+_POLL_INITIAL_DELAY = 0.05
+_POLL_MAX_DELAY = 2.0
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class CodegenTaskResult:
+    """Result of a completed Codegen Agent task, returned by every tool"""
+    status: str
+    result: Any
+    template_id: str
+    query: str
+
+def _copy_response(response: CodegenTaskResult) -> CodegenTaskResult:
+    """Copy a response deeply enough that callers cannot mutate a cached result"""
+    return dataclasses.replace(response, result=copy.deepcopy(response.result))
+
+# Completed results are reused for repeated identical requests, least recently used first out
+_RESPONSE_CACHE_SIZE = 512
+_RESPONSE_CACHE_TTL = 3600.0
+_response_cache: "OrderedDict[Tuple[str, str, bytes, bytes], Tuple[float, CodegenTaskResult]]" = OrderedDict()
+
+# Keep idle HTTP connections open long enough for MCP clients to reuse them between calls
+HTTP_UVICORN_CONFIG = {"timeout_keep_alive": 75}
 
 # Create the MCP server
 mcp = FastMCP("Codegen MCP Server")
@@ -79,15 +98,18 @@ TEMPLATES = {
     }
 }
 
+# Server configuration; the templates are fixed at import time, so it is built once
+CONFIG = {
+    "version": "1.0.0",
+    "endpoints": list(TEMPLATES.keys()),
+    "description": "Codegen MCP Server provides tools to execute Codegen Agent tasks."
+}
+
 # Configuration resource
 @mcp.resource("codegen://config")
 def get_config():
     """Get the Codegen MCP Server configuration."""
-    return {
-        "version": "1.0.0",
-        "endpoints": list(TEMPLATES.keys()),
-        "description": "Codegen MCP Server provides tools to execute Codegen Agent tasks."
-    }
+    return CONFIG
 
 # Templates resource
 @mcp.resource("codegen://templates")
@@ -109,8 +131,10 @@ async def run_codegen_task(
     query: str, 
     org_id: Optional[str] = None, 
     token: Optional[str] = None,
-    ctx: Optional[Context] = None
-) -> Dict[str, Any]:
+    ctx: Optional[Context] = None,
+    timeout: float = 600.0,
+    no_cache: bool = False
+) -> CodegenTaskResult:
     """
     Run a Codegen Agent task with the specified template and query.
     
@@ -120,9 +144,11 @@ async def run_codegen_task(
         org_id: Optional organization ID (defaults to environment variable)
         token: Optional API token (defaults to environment variable)
         ctx: Optional MCP context for progress reporting
+        timeout: Maximum time to wait for the task to complete, in seconds
+        no_cache: Run the task even if an identical request completed recently
     
     Returns:
-        A dictionary with the task result
+        The task result
     """
     if template_id not in TEMPLATES:
         raise ValueError(f"Template '{template_id}' not found")
@@ -134,6 +160,25 @@ async def run_codegen_task(
     if not org_id or not token:
         raise ValueError("Missing Codegen credentials. Provide org_id and token parameters or set CODEGEN_ORG_ID and CODEGEN_API_TOKEN environment variables.")
     
+    # Identical requests within the TTL are answered from the cache. The token is part of
+    # the key so a result is only returned to callers presenting the same credentials; it
+    # and the query are hashed so secrets and large inputs are not kept alive as keys
+    cache_key = (
+        template_id,
+        org_id,
+        hashlib.blake2b(token.encode(), digest_size=16).digest(),
+        hashlib.blake2b(query.encode(), digest_size=16).digest(),
+    )
+    if not no_cache:
+        cached = _response_cache.get(cache_key)
+        if cached is not None:
+            if time.monotonic() - cached[0] < _RESPONSE_CACHE_TTL:
+                _response_cache.move_to_end(cache_key)
+                if ctx:
+                    await ctx.info(f"Returning cached result for template: {template_id}")
+                return _copy_response(cached[1])
+            del _response_cache[cache_key]
+    
     # Create the agent
     agent = Agent(org_id=org_id, token=token)
     
@@ -145,16 +190,19 @@ async def run_codegen_task(
         await ctx.info(f"Starting Codegen task with template: {template_id}")
         await ctx.info(f"Query: {query}")
     
-    # Run the task
-    task = agent.run(prompt)
+    # Run the task; the SDK call blocks on network I/O, so keep it off the event loop
+    task = await anyio.to_thread.run_sync(agent.run, prompt)
     
     # Poll for completion
     if ctx:
         await ctx.info("Task submitted, waiting for completion...")
     
-    # Simple polling mechanism
+    # Simple polling mechanism, bounded by an overall deadline
+    deadline = time.monotonic() + timeout
+    delay = _POLL_INITIAL_DELAY
     while True:
-        task.refresh()
+        # refresh() is a blocking SDK call as well
+        await anyio.to_thread.run_sync(task.refresh)
         if task.status == "completed":
             if ctx:
                 await ctx.info("Task completed successfully!")
@@ -164,51 +212,69 @@ async def run_codegen_task(
             if ctx:
                 await ctx.error(error_msg)
             raise RuntimeError(error_msg)
+        elif time.monotonic() >= deadline:
+            error_msg = f"Task did not complete within {timeout:g} seconds"
+            if ctx:
+                await ctx.error(error_msg)
+            raise TimeoutError(error_msg)
         
         if ctx:
             await ctx.report_progress(0.5, "Task in progress...")
         
         # Wait before checking again
-        await asyncio.sleep(2)
-    
-    # Return the result
-    return {
-        "status": task.status,
-        "result": task.result,
-        "template_id": template_id,
-        "query": query
-    }
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, _POLL_MAX_DELAY)
+    
+    response = CodegenTaskResult(
+        status=task.status,
+        result=task.result,
+        template_id=template_id,
+        query=query
+    )
+    # Mock tasks go back to their pool once the result has been read; SDK tasks have no close()
+    close = getattr(task, "close", None)
+    if close is not None:
+        close()
+    
+    # The frozen dataclass does not freeze the result it holds, so the cache keeps its own copy
+    _response_cache[cache_key] = (time.monotonic(), _copy_response(response))
+    _response_cache.move_to_end(cache_key)
+    if len(_response_cache) > _RESPONSE_CACHE_SIZE:
+        _response_cache.popitem(last=False)
+    
+    return response
 
-# Create tools for each template
-for template_id, template_info in TEMPLATES.items():
-    # Use a factory function to capture the template_id in the closure
-    def create_tool(tid):
-        @mcp.tool(name=f"run_{tid}")
-        async def tool_fn(
-            query: str,
-            org_id: Optional[str] = None,
-            token: Optional[str] = None,
-            ctx: Context = None
-        ) -> Dict[str, Any]:
-            """
-            Run a Codegen Agent task with the specified template and query.
-            
-            Args:
-                query: The query to send to the agent
-                org_id: Optional organization ID (defaults to environment variable)
-                token: Optional API token (defaults to environment variable)
-            
-            Returns:
-                A dictionary with the task result
-            """
-            return await run_codegen_task(tid, query, org_id, token, ctx)
+def create_tool(tid):
+    """Register the run_<tid> tool for a template"""
+    @mcp.tool(name=f"run_{tid}")
+    async def tool_fn(
+        query: str,
+        org_id: Optional[str] = None,
+        token: Optional[str] = None,
+        no_cache: bool = False,
+        ctx: Context = None
+    ) -> CodegenTaskResult:
+        """
+        Run a Codegen Agent task with the specified template and query.
         
-        # Update the tool's docstring with the template description
-        tool_fn.__doc__ = f"{template_info['description']}\n\n{tool_fn.__doc__}"
+        Args:
+            query: The query to send to the agent
+            org_id: Optional organization ID (defaults to environment variable)
+            token: Optional API token (defaults to environment variable)
+            no_cache: Run the task even if an identical request completed recently
         
-        return tool_fn
+        Returns:
+            The task result
+        """
+        return await run_codegen_task(tid, query, org_id, token, ctx, no_cache=no_cache)
+    
+    # Update the tool's docstring with the template description
+    tool_fn.__doc__ = f"{TEMPLATES[tid]['description']}\n\n{tool_fn.__doc__}"
     
-    # Create the tool
+    return tool_fn
+
+# Create tools for each template
+for template_id in TEMPLATES:
     create_tool(template_id)
 
 # Generic tool that can use any template
@@ -218,8 +284,9 @@ async def run_codegen(
     query: str,
     org_id: Optional[str] = None,
     token: Optional[str] = None,
+    no_cache: bool = False,
     ctx: Context = None
-) -> Dict[str, Any]:
+) -> CodegenTaskResult:
     """
     Run a Codegen Agent task with the specified template and query.
     
@@ -228,11 +295,12 @@ async def run_codegen(
         query: The query to send to the agent
         org_id: Optional organization ID (defaults to environment variable)
         token: Optional API token (defaults to environment variable)
+        no_cache: Run the task even if an identical request completed recently
     
     Returns:
-        A dictionary with the task result
+        The task result
     """
-    return await run_codegen_task(template_id, query, org_id, token, ctx)
+    return await run_codegen_task(template_id, query, org_id, token, ctx, no_cache=no_cache)
 
 # Run the server if executed directly
 if __name__ == "__main__":
@@ -243,11 +311,18 @@ if __name__ == "__main__":
         host = os.environ.get("MCP_HOST", "127.0.0.1")
         port = int(os.environ.get("MCP_PORT", "8000"))
         path = os.environ.get("MCP_PATH", "/mcp")
-        mcp.run(transport=transport, host=host, port=port, path=path)
+        transport_kwargs = {"host": host, "port": port, "path": path, "uvicorn_config": dict(HTTP_UVICORN_CONFIG)}
     elif transport == "sse":
         host = os.environ.get("MCP_HOST", "127.0.0.1")
         port = int(os.environ.get("MCP_PORT", "8000"))
-        mcp.run(transport=transport, host=host, port=port)
+        transport_kwargs = {"host": host, "port": port, "uvicorn_config": dict(HTTP_UVICORN_CONFIG)}
     else:
         # Default to stdio
-        mcp.run(transport="stdio")
+        transport = "stdio"
+        transport_kwargs = {}
+    
+    # Equivalent to mcp.run(), but on uvloop when it is installed
+    anyio.run(
+        functools.partial(mcp.run_async, transport, **transport_kwargs),
+        backend_options={"use_uvloop": uvloop is not None},
+    )
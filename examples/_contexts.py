@@ -0,0 +1,15 @@
+"""
+Shared context strings for the Codegen template examples.
+"""
+
+PR_CREATION_CONTEXT = "Create a pull request for adding user authentication features. The changes include new login/logout endpoints, JWT token handling, and user session management."
+
+LINEAR_ISSUES_CONTEXT = "Create a main issue and sub-issues for implementing a user authentication system. The system should include registration, login, password reset, and profile management features. Each feature should be implemented as a separate API endpoint with appropriate validation and error handling."
+
+CODE_GENERATION_CONTEXT = "Create a Python function that takes a list of integers and returns the sum of all even numbers in the list. The function should handle edge cases like empty lists and non-integer inputs."
+
+DATA_ANALYSIS_CONTEXT = "Analyze the following sales data and provide insights on trends, patterns, and recommendations for improving sales performance: [Sales data would be provided here]"
+
+DOCUMENTATION_CONTEXT = "Create comprehensive documentation for a REST API that provides user authentication, product management, and order processing functionality. Include endpoints, request/response formats, authentication requirements, and example usage."
+
+TESTING_STRATEGY_CONTEXT = "Develop a comprehensive testing strategy for a new e-commerce platform that includes user authentication, product browsing, shopping cart, checkout, and order management features. The platform is built using a microservices architecture with Python FastAPI backends and a React frontend."
@@ -3,13 +3,14 @@ Example of using the PR creation endpoint.
 """
 
 from codegen_mcp_callable import CodegenMCPCallable
+from examples._contexts import PR_CREATION_CONTEXT
 
 # Create an instance of CodegenMCPCallable
 mcp = CodegenMCPCallable(org_id="323", token="sk-ce027fa7-3c8d-4beb-8c86-ed8ae982ac99")
 
 # Run on task
 task_result = mcp.create_pr(
-    context="Create a pull request for adding user authentication features. The changes include new login/logout endpoints, JWT token handling, and user session management."
+    context=PR_CREATION_CONTEXT
 )
 
 # Print the result
@@ -1,9 +1,12 @@
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Query
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel, Field
 from typing import Dict, Any, Optional, List
 import uvicorn
 import asyncio
 import os
+import time
+from dataclasses import dataclass
 from datetime import datetime
 import uuid
 from enum import Enum
@@ -18,6 +21,7 @@ except ImportError:
 # Configuration
 ORG_ID = os.getenv("ORG_ID", "323")
 API_TOKEN = os.getenv("API_TOKEN", "sk-ce027fa7-3c8d-4beb-8c86-ed8ae982ac99")
+TASK_TIMEOUT = float(os.getenv("TASK_TIMEOUT", "600"))
 
 # Model definitions
 class TaskStatus(str, Enum):
@@ -38,15 +42,37 @@ class TaskResponse(BaseModel):
     completed_at: Optional[str] = None
     endpoint: str
 
+@dataclass(slots=True)
+class TaskRecord:
+    """In-memory record for a submitted task"""
+    task_id: str
+    status: TaskStatus
+    result: Any
+    created_at: str
+    completed_at: Optional[str]
+    endpoint: str
+
+    def to_dict(self) -> Dict[str, Any]:
+        # Serialized directly by ORJSONResponse; TaskResponse only documents the shape
+        return {
+            "task_id": self.task_id,
+            "status": self.status,
+            "result": self.result,
+            "created_at": self.created_at,
+            "completed_at": self.completed_at,
+            "endpoint": self.endpoint,
+        }
+
 # Create FastAPI app
 app = FastAPI(
     title="MCP Prompt Template Server",
     description="MCP server with 6 specialized prompt template endpoints",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # Task storage
-tasks = {}
+tasks: Dict[str, TaskRecord] = {}
 
 # Prompt templates
 PROMPT_TEMPLATES = {
@@ -147,7 +173,8 @@ Please analyze the following context and develop a robust testing strategy:
 
 # Task execution functions
 async def execute_agent_task(task_id: str, endpoint: str, context: str, additional_params: Dict[str, Any]):
-    tasks[task_id]["status"] = TaskStatus.RUNNING
+    record = tasks[task_id]
+    record.status = TaskStatus.RUNNING
     
     try:
         # Get the appropriate template
@@ -161,174 +188,107 @@ async def execute_agent_task(task_id: str, endpoint: str, context: str, addition
         # Initialize the agent
         agent = Agent(org_id=ORG_ID, token=API_TOKEN)
         
-        # Run the agent with the formatted prompt
-        task = agent.run(formatted_prompt, **additional_params)
+        # Run the agent with the formatted prompt; the SDK call blocks on network I/O,
+        # so keep it off the event loop
+        task = await asyncio.to_thread(agent.run, formatted_prompt, **additional_params)
         
-        # Check status periodically
+        # Check status periodically, giving up once the task has run for TASK_TIMEOUT seconds
+        deadline = time.monotonic() + TASK_TIMEOUT
         while True:
-            task.refresh()
+            # refresh() is a blocking SDK call as well
+            await asyncio.to_thread(task.refresh)
             if task.status == "completed":
-                tasks[task_id]["status"] = TaskStatus.COMPLETED
-                tasks[task_id]["result"] = task.result
-                tasks[task_id]["completed_at"] = datetime.now().isoformat()
+                record.status = TaskStatus.COMPLETED
+                record.result = task.result
+                record.completed_at = datetime.now().isoformat()
                 break
             elif task.status == "failed":
-                tasks[task_id]["status"] = TaskStatus.FAILED
-                tasks[task_id]["result"] = {"error": "Agent task failed"}
-                tasks[task_id]["completed_at"] = datetime.now().isoformat()
+                record.status = TaskStatus.FAILED
+                record.result = {"error": "Agent task failed"}
+                record.completed_at = datetime.now().isoformat()
+                break
+            elif time.monotonic() >= deadline:
+                record.status = TaskStatus.FAILED
+                record.result = {"error": f"Agent task timed out after {TASK_TIMEOUT:g} seconds"}
+                record.completed_at = datetime.now().isoformat()
                 break
             await asyncio.sleep(2)  # Poll every 2 seconds
+        
+        # Mock tasks go back to their pool once the result has been read; SDK tasks have no close()
+        close = getattr(task, "close", None)
+        if close is not None:
+            close()
             
     except Exception as e:
-        tasks[task_id]["status"] = TaskStatus.FAILED
-        tasks[task_id]["result"] = {"error": str(e)}
-        tasks[task_id]["completed_at"] = datetime.now().isoformat()
-
-# API Endpoints for each template
-@app.post("/api/pr-creation", response_model=TaskResponse)
-async def pr_creation_endpoint(request: AgentRequest, background_tasks: BackgroundTasks):
-    task_id = str(uuid.uuid4())
-    tasks[task_id] = {
-        "task_id": task_id,
-        "status": TaskStatus.PENDING,
-        "result": None,
-        "created_at": datetime.now().isoformat(),
-        "completed_at": None,
-        "endpoint": "pr_creation"
-    }
+        record.status = TaskStatus.FAILED
+        record.result = {"error": str(e)}
+        record.completed_at = datetime.now().isoformat()
+
+def submit_task(endpoint: str, request: AgentRequest, background_tasks: BackgroundTasks) -> Dict[str, Any]:
+    """Create a task record for the endpoint and schedule its execution"""
+    record = TaskRecord(
+        task_id=uuid.uuid4().hex,
+        status=TaskStatus.PENDING,
+        result=None,
+        created_at=datetime.now().isoformat(),
+        completed_at=None,
+        endpoint=endpoint
+    )
+    tasks[record.task_id] = record
     
     background_tasks.add_task(
         execute_agent_task,
-        task_id=task_id,
-        endpoint="pr_creation",
+        task_id=record.task_id,
+        endpoint=endpoint,
         context=request.context,
         additional_params=request.additional_params
     )
     
-    return TaskResponse(**tasks[task_id])
+    return record.to_dict()
+
+# Responses are returned as plain dicts; the models are kept for the OpenAPI schema only
+TASK_RESPONSES = {200: {"model": TaskResponse}}
+TASK_LIST_RESPONSES = {200: {"model": List[TaskResponse]}}
 
-@app.post("/api/linear-issues", response_model=TaskResponse)
+# API Endpoints for each template
+@app.post("/api/pr-creation", response_model=None, responses=TASK_RESPONSES)
+async def pr_creation_endpoint(request: AgentRequest, background_tasks: BackgroundTasks):
+    return submit_task("pr_creation", request, background_tasks)
+
+@app.post("/api/linear-issues", response_model=None, responses=TASK_RESPONSES)
 async def linear_issues_endpoint(request: AgentRequest, background_tasks: BackgroundTasks):
-    task_id = str(uuid.uuid4())
-    tasks[task_id] = {
-        "task_id": task_id,
-        "status": TaskStatus.PENDING,
-        "result": None,
-        "created_at": datetime.now().isoformat(),
-        "completed_at": None,
-        "endpoint": "linear_issues"
-    }
-    
-    background_tasks.add_task(
-        execute_agent_task,
-        task_id=task_id,
-        endpoint="linear_issues",
-        context=request.context,
-        additional_params=request.additional_params
-    )
-    
-    return TaskResponse(**tasks[task_id])
+    return submit_task("linear_issues", request, background_tasks)
 
-@app.post("/api/code-generation", response_model=TaskResponse)
+@app.post("/api/code-generation", response_model=None, responses=TASK_RESPONSES)
 async def code_generation_endpoint(request: AgentRequest, background_tasks: BackgroundTasks):
-    task_id = str(uuid.uuid4())
-    tasks[task_id] = {
-        "task_id": task_id,
-        "status": TaskStatus.PENDING,
-        "result": None,
-        "created_at": datetime.now().isoformat(),
-        "completed_at": None,
-        "endpoint": "code_generation"
-    }
-    
-    background_tasks.add_task(
-        execute_agent_task,
-        task_id=task_id,
-        endpoint="code_generation",
-        context=request.context,
-        additional_params=request.additional_params
-    )
-    
-    return TaskResponse(**tasks[task_id])
+    return submit_task("code_generation", request, background_tasks)
 
-@app.post("/api/data-analysis", response_model=TaskResponse)
+@app.post("/api/data-analysis", response_model=None, responses=TASK_RESPONSES)
 async def data_analysis_endpoint(request: AgentRequest, background_tasks: BackgroundTasks):
-    task_id = str(uuid.uuid4())
-    tasks[task_id] = {
-        "task_id": task_id,
-        "status": TaskStatus.PENDING,
-        "result": None,
-        "created_at": datetime.now().isoformat(),
-        "completed_at": None,
-        "endpoint": "data_analysis"
-    }
-    
-    background_tasks.add_task(
-        execute_agent_task,
-        task_id=task_id,
-        endpoint="data_analysis",
-        context=request.context,
-        additional_params=request.additional_params
-    )
-    
-    return TaskResponse(**tasks[task_id])
+    return submit_task("data_analysis", request, background_tasks)
 
-@app.post("/api/documentation", response_model=TaskResponse)
+@app.post("/api/documentation", response_model=None, responses=TASK_RESPONSES)
 async def documentation_endpoint(request: AgentRequest, background_tasks: BackgroundTasks):
-    task_id = str(uuid.uuid4())
-    tasks[task_id] = {
-        "task_id": task_id,
-        "status": TaskStatus.PENDING,
-        "result": None,
-        "created_at": datetime.now().isoformat(),
-        "completed_at": None,
-        "endpoint": "documentation"
-    }
-    
-    background_tasks.add_task(
-        execute_agent_task,
-        task_id=task_id,
-        endpoint="documentation",
-        context=request.context,
-        additional_params=request.additional_params
-    )
-    
-    return TaskResponse(**tasks[task_id])
+    return submit_task("documentation", request, background_tasks)
 
-@app.post("/api/testing-strategy", response_model=TaskResponse)
+@app.post("/api/testing-strategy", response_model=None, responses=TASK_RESPONSES)
 async def testing_strategy_endpoint(request: AgentRequest, background_tasks: BackgroundTasks):
-    task_id = str(uuid.uuid4())
-    tasks[task_id] = {
-        "task_id": task_id,
-        "status": TaskStatus.PENDING,
-        "result": None,
-        "created_at": datetime.now().isoformat(),
-        "completed_at": None,
-        "endpoint": "testing_strategy"
-    }
-    
-    background_tasks.add_task(
-        execute_agent_task,
-        task_id=task_id,
-        endpoint="testing_strategy",
-        context=request.context,
-        additional_params=request.additional_params
-    )
-    
-    return TaskResponse(**tasks[task_id])
+    return submit_task("testing_strategy", request, background_tasks)
 
 # Endpoint to check task status
-@app.get("/api/tasks/{task_id}", response_model=TaskResponse)
+@app.get("/api/tasks/{task_id}", response_model=None, responses=TASK_RESPONSES)
 async def get_task_status(task_id: str):
     if task_id not in tasks:
         raise HTTPException(status_code=404, detail="Task not found")
     
-    return TaskResponse(**tasks[task_id])
-
-# Endpoint to list all tasks
-@app.get("/api/tasks", response_model=List[TaskResponse])
-async def list_tasks():
-    return [TaskResponse(**task) for task in tasks.values()]
+    return tasks[task_id].to_dict()
+
+# Endpoint to list all tasks, or only the given IDs so clients can poll a batch in one request
+@app.get("/api/tasks", response_model=None, responses=TASK_LIST_RESPONSES)
+async def list_tasks(ids: Optional[List[str]] = Query(default=None)):
+    if ids is None:
+        return [record.to_dict() for record in tasks.values()]
+    return [tasks[task_id].to_dict() for task_id in ids if task_id in tasks]
 
 # Health check endpoint
 @app.get("/health")
@@ -0,0 +1,111 @@
+"""Tests for the Codegen MCP server's response cache"""
+
+import json
+
+import pytest
+
+import codegen_mcp_server
+from fastmcp import Client
+
+
+class FakeTask:
+    def __init__(self, prompt):
+        self.status = "completed"
+        self.result = {"prompt": prompt}
+
+    def refresh(self):
+        pass
+
+
+class FakeAgent:
+    def __init__(self, runs, org_id=None, token=None):
+        self.runs = runs
+
+    def run(self, prompt):
+        self.runs.append(prompt)
+        return FakeTask(prompt)
+
+
+@pytest.fixture
+def runs(monkeypatch):
+    runs = []
+    monkeypatch.setenv("CODEGEN_ORG_ID", "org")
+    monkeypatch.setenv("CODEGEN_API_TOKEN", "token")
+    monkeypatch.setattr(
+        codegen_mcp_server,
+        "Agent",
+        lambda org_id=None, token=None: FakeAgent(runs, org_id, token),
+    )
+    codegen_mcp_server._response_cache.clear()
+    yield runs
+    codegen_mcp_server._response_cache.clear()
+
+
+async def call(query, **arguments):
+    async with Client(codegen_mcp_server.mcp) as client:
+        result = await client.call_tool("run_endpoint3", {"query": query, **arguments})
+    return json.loads(result[0].text)
+
+
+async def test_repeated_request_is_cached(runs):
+    first = await call("q")
+    second = await call("q")
+    assert first == second
+    assert len(runs) == 1
+
+
+async def test_different_token_misses_cache(runs):
+    await call("q", token="first")
+    await call("q", token="second")
+    await call("q", token="first")
+    assert len(runs) == 2
+
+
+async def test_different_query_misses_cache(runs):
+    await call("q1")
+    await call("q2")
+    assert len(runs) == 2
+
+
+async def test_no_cache_bypasses_cache(runs):
+    await call("q")
+    await call("q", no_cache=True)
+    assert len(runs) == 2
+    await call("q")
+    assert len(runs) == 2
+
+
+async def test_expired_entry_is_dropped(runs):
+    await call("q")
+    for key, (stored_at, response) in codegen_mcp_server._response_cache.items():
+        codegen_mcp_server._response_cache[key] = (
+            stored_at - codegen_mcp_server._RESPONSE_CACHE_TTL,
+            response,
+        )
+    await call("q")
+    assert len(runs) == 2
+    assert len(codegen_mcp_server._response_cache) == 1
+
+
+async def test_least_recently_used_entry_is_evicted(runs, monkeypatch):
+    monkeypatch.setattr(codegen_mcp_server, "_RESPONSE_CACHE_SIZE", 2)
+    await call("q1")
+    await call("q2")
+    await call("q1")
+    await call("q3")
+    assert len(runs) == 3
+    assert len(codegen_mcp_server._response_cache) == 2
+    await call("q1")
+    assert len(runs) == 3
+    await call("q2")
+    assert len(runs) == 4
+
+
+async def test_cached_result_is_not_shared(runs):
+    first = await codegen_mcp_server.run_codegen_task("endpoint3", "q")
+    first.result["prompt"] = "changed"
+    second = await codegen_mcp_server.run_codegen_task("endpoint3", "q")
+    second.result["prompt"] = "changed again"
+    third = await codegen_mcp_server.run_codegen_task("endpoint3", "q")
+    assert third.result == {"prompt": "{PromptTemplate3+q}"}
+    assert len(runs) == 1
@@ -0,0 +1,90 @@
+"""Tests for batch task listing in the prompt template server and its client"""
+
+import pytest
+
+pytest.importorskip("fastapi")
+
+from fastapi.testclient import TestClient
+
+import mcp_server
+from client import MCPClient
+from mcp_server import TaskRecord, TaskStatus
+
+
+def record(task_id, status=TaskStatus.COMPLETED):
+    return TaskRecord(
+        task_id=task_id,
+        status=status,
+        result={"message": task_id},
+        created_at="2024-01-01T00:00:00",
+        completed_at="2024-01-01T00:00:01",
+        endpoint="pr_creation",
+    )
+
+
+@pytest.fixture
+def tasks(monkeypatch):
+    tasks = {task_id: record(task_id) for task_id in ("a", "b", "c")}
+    monkeypatch.setattr(mcp_server, "tasks", tasks)
+    return tasks
+
+
+@pytest.fixture
+def http(tasks):
+    with TestClient(mcp_server.app) as http:
+        yield http
+
+
+@pytest.fixture
+def client(http):
+    client = MCPClient("http://testserver")
+    client._session = http
+    return client
+
+
+def test_list_tasks_without_ids_returns_all(http):
+    response = http.get("/api/tasks")
+    assert response.status_code == 200
+    assert [task["task_id"] for task in response.json()] == ["a", "b", "c"]
+
+
+def test_list_tasks_filters_by_ids(http):
+    response = http.get("/api/tasks", params={"ids": ["c", "a"]})
+    assert [task["task_id"] for task in response.json()] == ["c", "a"]
+
+
+def test_list_tasks_omits_unknown_ids(http):
+    response = http.get("/api/tasks?ids=a&ids=missing&ids=b")
+    assert [task["task_id"] for task in response.json()] == ["a", "b"]
+
+
+def test_client_list_tasks_with_empty_ids(client):
+    assert client.list_tasks(task_ids=[]) == []
+
+
+def test_client_list_tasks_with_ids(client):
+    assert [task["task_id"] for task in client.list_tasks(task_ids=["b"])] == ["b"]
+
+
+def test_wait_for_tasks_rejects_unknown_ids(client):
+    with pytest.raises(ValueError, match="missing"):
+        client.wait_for_tasks(["a", "missing"], timeout=1)
+
+
+def test_wait_for_tasks_preserves_order_with_duplicates(client):
+    results = client.wait_for_tasks(["c", "a", "c", "b"], timeout=1)
+    assert [task["task_id"] for task in results] == ["c", "a", "c", "b"]
+
+
+def test_wait_for_tasks_polls_until_finished(client, tasks):
+    tasks["b"].status = TaskStatus.RUNNING
+    original = client.list_tasks
+
+    def list_tasks(task_ids=None):
+        result = original(task_ids=task_ids)
+        tasks["b"].status = TaskStatus.COMPLETED
+        return result
+
+    client.list_tasks = list_tasks
+    results = client.wait_for_tasks(["a", "b"], timeout=1, polling_interval=0.01)
+    assert [task["status"] for task in results] == ["completed", "completed"]
@@ -0,0 +1,113 @@
+"""Tests for the mock Codegen SDK's batch classifier"""
+
+import threading
+
+import pytest
+
+import mock_codegen
+
+np = pytest.importorskip("numpy")
+
+PROMPTS = [
+    b"[PR CREATION TEMPLATE]\nCreate a PR",
+    b"context first\n[TESTING STRATEGY TEMPLATE]",
+    b"[DOCUMENTATION TEMPLATE] then [CODE GENERATION TEMPLATE]",
+    b"[DATA ANALYSIS TEMPLATE][LINEAR ISSUE CREATION TEMPLATE]",
+    b"x [LINEAR ISSUE CREATION TEMPLATE] y [PR CREATION TEMPLATE] z",
+    b"[PR CREATION TEMPLATE",
+    b"no template tag at all",
+    b"",
+]
+
+
+def scan(kernel, prompts):
+    offsets = np.zeros(len(prompts) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(prompt) for prompt in prompts])
+    data = np.frombuffer(b"".join(prompts), dtype=np.uint8)
+    out = np.full(len(prompts), -1, dtype=np.int8)
+    tags = np.frombuffer(mock_codegen._TAG_BYTES, dtype=np.uint8)
+    tag_offsets = np.array(mock_codegen._TAG_OFFSETS, dtype=np.int64)
+    return kernel(data, offsets, tags, tag_offsets, out)
+
+
+def expected_indices(prompts):
+    types = [mock_codegen._template_type(prompt) for prompt in prompts]
+    return [
+        -1 if t is None else mock_codegen._TEMPLATE_TYPES.index(t) for t in types
+    ]
+
+
+def test_scan_tags_matches_classify():
+    assert list(scan(mock_codegen._scan_tags, PROMPTS)) == expected_indices(PROMPTS)
+
+
+def test_scan_tags_single_prompt():
+    for prompt in PROMPTS:
+        assert list(scan(mock_codegen._scan_tags, [prompt])) == expected_indices(
+            [prompt]
+        )
+
+
+def test_compiled_kernel_matches_classify():
+    kernel = mock_codegen._batch_kernel()
+    if kernel is None:
+        pytest.skip("no compiled batch kernel available")
+    assert list(scan(kernel.scan, PROMPTS)) == expected_indices(PROMPTS)
+
+
+def test_classify_batch_matches_classify():
+    assert mock_codegen._classify_batch(PROMPTS) == [
+        mock_codegen._classify(prompt) for prompt in PROMPTS
+    ]
+
+
+def test_non_ascii_characters_do_not_form_a_tag():
+    agent = mock_codegen.Agent("org", "token")
+    task = agent.run("[PR\u00e9 CREATION TEMPLATE]")
+    task.refresh()
+    assert task.result == {
+        "message": "Mock result for unknown template type",
+        "prompt": "[PR\u00e9 CREATION TEMPLATE]",
+    }
+    task.close()
+
+
+def test_double_close_does_not_alias_tasks():
+    agent = mock_codegen.Agent("org", "token")
+    task = agent.run("first")
+    task.close()
+    task.close()
+    first = agent.run("second")
+    second = agent.run("third")
+    assert first is not second
+    assert (first.prompt, second.prompt) == ("second", "third")
+    first.close()
+    second.close()
+
+
+def test_concurrent_double_close_does_not_alias_tasks():
+    agent = mock_codegen.Agent("org", "token")
+    for _ in range(200):
+        task = agent.run("prompt")
+        threads = [threading.Thread(target=task.close) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        first = agent.run("a")
+        second = agent.run("b")
+        assert first is not second
+        first.close()
+        second.close()
+
+
+def test_unknown_template_result_includes_prompt():
+    agent = mock_codegen.Agent("org", "token")
+    tasks = agent.run_many(["untagged one", "[PR CREATION TEMPLATE]", "untagged two"])
+    for task in tasks:
+        task.refresh()
+    assert tasks[0].result["prompt"] == "untagged one"
+    assert "prompt" not in tasks[1].result
+    assert tasks[2].result["prompt"] == "untagged two"
+    for task in tasks:
+        task.close()